@@ -1,97 +1,263 @@
 from flask import Flask, request, jsonify, render_template
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 import os
-import uuid
-import tempfile
-from werkzeug.utils import secure_filename
-import traceback
+import copy
+import queue
+import atexit
+import logging
+import logging.handlers
+import hashlib
+import threading
+from collections import OrderedDict
 import sys
 
+# Response compression is optional
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+# Faster JSON serialization is optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Log through a queue so request threads never block on console writes
+logger = logging.getLogger('resume-analyzer')
+logger.setLevel(logging.DEBUG if os.environ.get('FLASK_DEV') == '1' else logging.INFO)
+logger.propagate = False
+_log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 # Add current directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Try to import analyzer classes
-try:
-    from resume_analyzer import ResumeAnalyzer
-    from ats_scorer import ATSScorer
-    ANALYZER_AVAILABLE = True
-    print("✓ Resume analyzer imported successfully")
-except ImportError as e:
-    print(f"⚠️ Could not import analyzer modules: {e}")
-    print("⚠️ Running in demo mode with mock data")
-    ANALYZER_AVAILABLE = False
-    
-    # Mock classes for testing
-    class ResumeAnalyzer:
-        def extract_and_clean_resume(self, filepath):
-            return {
-                'cleaned_text': 'Sample resume text for demonstration. This is a mock response when analyzer modules are not available.',
-                'cleaning_report': {
-                    'original_length': 1000,
-                    'final_length': 950,
-                    'tables_removed': 2,
-                    'images_detected': 1,
-                    'unusual_chars_removed': 5,
-                    'headers_footers_removed': 3,
-                    'reduction_percentage': 5.0
-                },
-                'validation': {
-                    'word_count': 650,
-                    'validation_passed': True,
-                    'issues': []
-                },
-                'contact_info': {
-                    'email': 'demo@example.com',
-                    'phone': '(123) 456-7890'
-                },
-                'word_density': {
-                    'total_words': 650,
-                    'unique_words': 320,
-                    'top_keywords': [('python', 15), ('development', 12), ('project', 10)],
-                    'keyword_density': {'python': 2.3, 'development': 1.8}
-                }
-            }
-        
-        def analyze_resume(self, text):
-            return {
+# Mock classes used in demo mode when the analyzer modules can't be imported
+class MockResumeAnalyzer:
+    def extract_and_clean_resume(self, filepath):
+        return {
+            'cleaned_text': 'Sample resume text for demonstration. This is a mock response when analyzer modules are not available.',
+            'cleaning_report': {
+                'original_length': 1000,
+                'final_length': 950,
+                'tables_removed': 2,
+                'images_detected': 1,
+                'unusual_chars_removed': 5,
+                'headers_footers_removed': 3,
+                'reduction_percentage': 5.0
+            },
+            'validation': {
                 'word_count': 650,
-                'character_count': 3500,
-                'skills_found': ['Python', 'JavaScript', 'React', 'Communication', 'Teamwork'],
-                'skills_count': 5,
-                'technical_skills': ['Python', 'JavaScript', 'React'],
-                'soft_skills': ['Communication', 'Teamwork'],
-                'readability_score': 78.5,
-                'quantifiable_achievements': ['Increased sales by 30%', 'Reduced costs by 20%'],
-                'action_verbs_count': 12,
-                'skills_match_percentage': 65.0,
-                'missing_skills': ['AWS', 'Docker', 'Kubernetes'],
-                'has_summary': True,
-                'has_education': True,
-                'has_experience': True
+                'validation_passed': True,
+                'issues': []
+            },
+            'contact_info': {
+                'email': 'demo@example.com',
+                'phone': '(123) 456-7890'
+            },
+            'word_density': {
+                'total_words': 650,
+                'unique_words': 320,
+                'top_keywords': [('python', 15), ('development', 12), ('project', 10)],
+                'keyword_density': {'python': 2.3, 'development': 1.8}
             }
+        }
+
+    def extract_and_clean_from_bytes(self, buf):
+        return self.extract_and_clean_resume(None)
+
+    def analyze_resume(self, text):
+        return {
+            'word_count': 650,
+            'character_count': 3500,
+            'skills_found': ['Python', 'JavaScript', 'React', 'Communication', 'Teamwork'],
+            'skills_count': 5,
+            'technical_skills': ['Python', 'JavaScript', 'React'],
+            'soft_skills': ['Communication', 'Teamwork'],
+            'readability_score': 78.5,
+            'quantifiable_achievements': ['Increased sales by 30%', 'Reduced costs by 20%'],
+            'action_verbs_count': 12,
+            'skills_match_percentage': 65.0,
+            'missing_skills': ['AWS', 'Docker', 'Kubernetes'],
+            'has_summary': True,
+            'has_education': True,
+            'has_experience': True
+        }
+
+class MockATSScorer:
+    def calculate_score(self, resume_text, job_description=""):
+        return {
+            'ats_score': 78.5,
+            'keyword_match_percentage': 65.0,
+            'matched_keywords': ['python', 'javascript', 'react', 'development'],
+            'missing_keywords': ['aws', 'docker', 'typescript', 'node.js'],
+            'section_compliance': 85.0,
+            'format_issues': []
+        }
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider that serializes responses with orjson"""
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option).decode()
     
-    class ATSScorer:
-        def calculate_score(self, resume_text, job_description=""):
-            return {
-                'ats_score': 78.5,
-                'keyword_match_percentage': 65.0,
-                'matched_keywords': ['python', 'javascript', 'react', 'development'],
-                'missing_keywords': ['aws', 'docker', 'typescript', 'node.js'],
-                'section_compliance': 85.0,
-                'format_issues': []
-            }
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+# Shared analyzer instances, built once per process; the analyzers keep no
+# per-request state so one instance can serve concurrent requests
+_analyzers = None
+_analyzers_lock = threading.Lock()
+
+# Tiny resume used to exercise the analysis pipeline during warm-up
+WARMUP_RESUME = b"Summary\nPython developer with experience in Flask and SQL.\nEducation\nBSc Computer Science\n"
+
+def load_analyzers():
+    """Import the analyzer modules and build the shared instances on first use"""
+    global _analyzers
+    if _analyzers is None:
+        with _analyzers_lock:
+            if _analyzers is None:
+                try:
+                    from resume_analyzer import ResumeAnalyzer
+                    from ats_scorer import ATSScorer
+                    logger.info("✓ Resume analyzer imported successfully")
+                    _analyzers = (ResumeAnalyzer(), ATSScorer(), True)
+                except ImportError as e:
+                    logger.warning(f"⚠️ Could not import analyzer modules: {e}")
+                    logger.warning("⚠️ Running in demo mode with mock data")
+                    _analyzers = (MockResumeAnalyzer(), MockATSScorer(), False)
+    return _analyzers
+
+def get_analyzer():
+    """Shared ResumeAnalyzer instance"""
+    return load_analyzers()[0]
+
+def get_scorer():
+    """Shared ATSScorer instance"""
+    return load_analyzers()[1]
+
+def analyzer_available():
+    return load_analyzers()[2]
+
+def warm_up():
+    """Build the shared analyzers and run a tiny resume through them ahead of the first request"""
+    analyzer, ats_scorer, _ = load_analyzers()
+    try:
+        extraction_result = analyzer.extract_and_clean_from_bytes(WARMUP_RESUME)
+        analyzer.analyze_resume(extraction_result['cleaned_text'])
+        ats_scorer.calculate_score(extraction_result['cleaned_text'], extraction_result['cleaned_text'])
+    except Exception as e:
+        logger.warning(f"⚠️ Analyzer warm-up failed: {e}")
 
 app = Flask(__name__, template_folder='templates')
 CORS(app)
+if orjson is not None:
+    app.json = ORJSONProvider(app)
 
 # Configuration
-app.config['UPLOAD_FOLDER'] = tempfile.gettempdir()
 app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024  # 5MB
+app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html']
+app.config['COMPRESS_MIN_SIZE'] = 500
+if Compress is not None:
+    Compress(app)
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc', 'txt'}
 
+# Leading bytes an upload must start with to match its extension
+FILE_SIGNATURES = {'pdf': b'%PDF', 'docx': b'PK\x03\x04'}
+
+# The UI shows at most this many matched/missing keywords; full counts are sent separately
+KEYWORD_RESPONSE_LIMIT = 15
+
+# Weights for the overall score (see README "Scoring Algorithm")
+OVERALL_SCORE_WEIGHTS = {
+    'ats_score': 0.35,
+    'keyword_match': 0.25,
+    'skills_match': 0.15,
+    'readability': 0.10,
+    'validation': 0.15
+}
+
+# Extraction results keyed by the SHA-256 of the upload so re-submitting
+# the same resume skips the parse/clean step; results whose cleaned text is
+# longer than any real resume are not cached, bounding the cache to a few MB
+EXTRACTION_CACHE_SIZE = 128
+EXTRACTION_CACHE_MAX_CHARS = 100_000
+_extraction_cache = OrderedDict()
+
+# Analysis results keyed by the SHA-256 of the cleaned text, and ATS results keyed
+# by the cleaned text and job description hashes
+RESULT_CACHE_SIZE = 256
+_analysis_cache = OrderedDict()
+_ats_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+# Load the analyzer modules in the background so startup isn't blocked on PyMuPDF;
+# SKIP_WARMUP=1 leaves them to load on the first request (e.g. for tests and scripts)
+if os.environ.get('SKIP_WARMUP') != '1':
+    threading.Thread(target=warm_up, name='analyzer-warmup', daemon=True).start()
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def matches_signature(file_storage):
+    """Check the upload's leading bytes against its extension without consuming the stream"""
+    signature = FILE_SIGNATURES.get(file_storage.filename.rsplit('.', 1)[1].lower())
+    if signature is None:
+        return True
+    head = file_storage.stream.read(len(signature))
+    file_storage.stream.seek(0)
+    return head == signature
+
+@app.errorhandler(413)
+def file_too_large(e):
+    """Return a JSON error for uploads over the size limit"""
+    max_mb = app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+    return jsonify({'error': f'File too large. Maximum size is {max_mb}MB', 'success': False}), 413
+
+def get_analysis(analyzer, cleaned_text, text_hash):
+    """Analyze resume content, reusing a cached result when available"""
+    analysis = cache_get(_analysis_cache, text_hash)
+    if analysis is None:
+        logger.info("📊 Analyzing resume content...")
+        analysis = analyzer.analyze_resume(cleaned_text)
+        cache_put(_analysis_cache, text_hash, analysis, RESULT_CACHE_SIZE)
+    return analysis
+
+def get_ats_results(ats_scorer, cleaned_text, job_description, ats_key):
+    """Calculate the ATS score, reusing a cached result when available"""
+    ats_results = cache_get(_ats_cache, ats_key)
+    if ats_results is None:
+        logger.info("🎯 Calculating ATS score...")
+        ats_results = ats_scorer.calculate_score(cleaned_text, job_description)
+        if ats_results.get('success', True):
+            cache_put(_ats_cache, ats_key, ats_results, RESULT_CACHE_SIZE)
+    return ats_results
+
+def cache_get(cache, key):
+    """Return a copy of a cached result, or None on a miss"""
+    with _cache_lock:
+        if key not in cache:
+            return None
+        cache.move_to_end(key)
+        return copy.deepcopy(cache[key])
+
+def cache_put(cache, key, value, max_size):
+    """Store a copy of a result, evicting the least recently used entry"""
+    with _cache_lock:
+        cache[key] = copy.deepcopy(value)
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+
 @app.route('/')
 def index():
     """Render the main HTML page"""
@@ -101,14 +267,15 @@ def index():
 def analyze_resume():
     """API endpoint for resume analysis"""
     try:
-        print("🔍 Analysis request received")
+        logger.info("🔍 Analysis request received")
         
         # Check if file was uploaded
         if 'resume' not in request.files:
             return jsonify({'error': 'No resume file provided'}), 400
         
         resume_file = request.files['resume']
-        job_description = request.form.get('job_description', '')
+        # Normalize once so whitespace-only variants share the ATS cache entry
+        job_description = request.form.get('job_description', '').strip()
         
         # Check if file is empty
         if resume_file.filename == '':
@@ -120,34 +287,38 @@ def analyze_resume():
                 'error': f'File type not allowed. Please upload: {", ".join(ALLOWED_EXTENSIONS)}'
             }), 400
         
-        # Create uploads directory if it doesn't exist
-        upload_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
-        os.makedirs(upload_dir, exist_ok=True)
+        # Check the content matches the extension before extracting it
+        if not matches_signature(resume_file):
+            return jsonify({'error': 'File content does not match its extension', 'success': False}), 400
         
-        # Save file with unique name
-        original_filename = secure_filename(resume_file.filename)
-        filename = f"{uuid.uuid4()}_{original_filename}"
-        filepath = os.path.join(upload_dir, filename)
+        # Shared analyzers (imported and built on first use)
+        analyzer = get_analyzer()
+        ats_scorer = get_scorer()
         
-        print(f"📁 Saving file: {original_filename} -> {filepath}")
-        resume_file.save(filepath)
+        # Read the upload into memory (bounded by MAX_CONTENT_LENGTH) and hash it so
+        # repeated submissions reuse the previous extraction
+        file_bytes = resume_file.read()
+        file_hash = hashlib.sha256(file_bytes).hexdigest()
         
-        # Initialize analyzers
-        analyzer = ResumeAnalyzer()
-        ats_scorer = ATSScorer()
+        extraction_result = cache_get(_extraction_cache, file_hash)
+        if extraction_result is not None:
+            logger.info(f"⚡ Using cached extraction for {file_hash[:12]}")
+        else:
+            # Extract and clean resume
+            logger.info(f"🔄 Extracting and cleaning resume: {resume_file.filename} ({len(file_bytes)} bytes)")
+            extraction_result = analyzer.extract_and_clean_from_bytes(file_bytes)
+            if len(extraction_result['cleaned_text']) <= EXTRACTION_CACHE_MAX_CHARS:
+                cache_put(_extraction_cache, file_hash, extraction_result, EXTRACTION_CACHE_SIZE)
         
-        # Extract, clean, and analyze resume
-        print("🔄 Extracting and cleaning resume...")
-        extraction_result = analyzer.extract_and_clean_resume(filepath)
         cleaned_text = extraction_result['cleaned_text']
+        text_hash = hashlib.sha256(cleaned_text.encode('utf-8')).hexdigest()
+        ats_key = (text_hash, hashlib.sha256(job_description.encode('utf-8')).hexdigest())
         
         # Analyze resume
-        print("📊 Analyzing resume content...")
-        analysis = analyzer.analyze_resume(cleaned_text)
+        analysis = get_analysis(analyzer, cleaned_text, text_hash)
         
-        # Calculate ATS score against job description
-        print("🎯 Calculating ATS score...")
-        ats_results = ats_scorer.calculate_score(cleaned_text, job_description)
+        # Calculate ATS score
+        ats_results = get_ats_results(ats_scorer, cleaned_text, job_description, ats_key)
         
         # Calculate overall score
         overall_score = calculate_overall_score(analysis, ats_results, extraction_result.get('validation', {}))
@@ -155,6 +326,10 @@ def analyze_resume():
         # Generate recommendations
         recommendations = generate_recommendations(analysis, ats_results, extraction_result)
         
+        # Only send the keywords the UI displays
+        for key in ('matched_keywords', 'missing_keywords'):
+            ats_results[key] = ats_results.get(key, [])[:KEYWORD_RESPONSE_LIMIT]
+        
         # Combine results
         results = {
             'resume_analysis': analysis,
@@ -166,28 +341,25 @@ def analyze_resume():
             'contact_info': extraction_result.get('contact_info', {}),
             'cleaned_text_preview': cleaned_text[:500] + "..." if len(cleaned_text) > 500 else cleaned_text,
             'word_density': extraction_result.get('word_density', {}),
-            'demo_mode': not ANALYZER_AVAILABLE,
+            'demo_mode': not analyzer_available(),
             'success': True
         }
         
-        print(f"✅ Analysis complete. Overall score: {overall_score}")
-        
-        # Clean up file
-        try:
-            os.remove(filepath)
-            print(f"🗑️ Cleaned up temporary file: {filepath}")
-        except Exception as e:
-            print(f"⚠️ Could not remove temporary file: {e}")
+        logger.info(f"✅ Analysis complete. Overall score: {overall_score}")
         
         return jsonify(results)
         
+    except RequestEntityTooLarge:
+        # Werkzeug raises this while parsing a body over MAX_CONTENT_LENGTH; let the 413 handler answer
+        raise
+        
     except ValueError as e:
-        print(f"❌ ValueError: {str(e)}")
+        logger.warning(f"❌ ValueError: {str(e)}")
         return jsonify({'error': str(e), 'success': False}), 400
         
     except Exception as e:
-        print(f"❌ Unexpected error: {str(e)}")
-        print(traceback.format_exc())
+        # Full traceback only when debug logging is enabled
+        logger.error(f"❌ Unexpected error: {str(e)}", exc_info=logger.isEnabledFor(logging.DEBUG))
         return jsonify({
             'error': 'Internal server error. Please try again.',
             'details': str(e) if app.debug else None,
@@ -197,13 +369,7 @@ def analyze_resume():
 def calculate_overall_score(analysis, ats_results, validation):
     """Calculate weighted overall score"""
     try:
-        weights = {
-            'ats_score': 0.35,
-            'keyword_match': 0.25,
-            'skills_match': 0.15,
-            'readability': 0.10,
-            'validation': 0.15
-        }
+        weights = OVERALL_SCORE_WEIGHTS
         
         # Validation score
         validation_score = 100
@@ -220,7 +386,7 @@ def calculate_overall_score(analysis, ats_results, validation):
         
         return round(min(score, 100), 1)
     except Exception as e:
-        print(f"⚠️ Error calculating overall score: {e}")
+        logger.warning(f"⚠️ Error calculating overall score: {e}")
         return 70.0
 
 def generate_recommendations(analysis, ats_results, extraction_result):
@@ -279,7 +445,7 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'service': 'resume-analyzer',
-        'analyzer_available': ANALYZER_AVAILABLE,
+        'analyzer_available': analyzer_available(),
         'success': True
     })
 
@@ -291,16 +457,17 @@ def favicon():
 if __name__ == '__main__':
     # Create necessary directories
     os.makedirs('templates', exist_ok=True)
-    os.makedirs('uploads', exist_ok=True)
     
     print("\n" + "="*50)
     print("🚀 Resume Analyzer Server Starting...")
     print("="*50)
     print(f"📁 Template directory: {os.path.join(os.getcwd(), 'templates')}")
-    print(f"📁 Upload directory: {os.path.join(os.getcwd(), 'uploads')}")
-    print(f"🔧 Analyzer available: {ANALYZER_AVAILABLE}")
+    print(f"🔧 Analyzer available: {analyzer_available()}")
+    print(f"🗜️ Response compression: {Compress is not None}")
     print("\n✅ Server is ready!")
     print("🌐 Open http://localhost:5000 in your browser")
+    print("💡 For production, run under gunicorn: gunicorn -w 4 -k gthread --threads 4 app:app")
     print("="*50 + "\n")
     
-    app.run(debug=True, port=5000, host='0.0.0.0')
\ No newline at end of file
+    # Debug mode (reloader + interactive debugger) only when explicitly requested
+    app.run(debug=os.environ.get('FLASK_DEV') == '1', port=5000, host='0.0.0.0', threaded=True)
\ No newline at end of file
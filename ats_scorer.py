@@ -1,6 +1,35 @@
 import re
+import heapq
+import hashlib
+import logging
+import threading
+from operator import itemgetter
 from typing import Dict, List
-from collections import Counter
+from collections import Counter, OrderedDict
+
+from resume_analyzer import TABLE_RE
+
+# Child of the app's logger, so records go through its queued handler
+logger = logging.getLogger(f'resume-analyzer.{__name__}')
+
+# Lowercase keyword tokens: a letter followed by at least two letters/digits
+TOKEN_RE = re.compile(r'\b[a-z][a-z0-9]{2,}\b')
+
+# Common stopwords, shared read-only by every scorer instance
+STOP_WORDS = frozenset(['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of',
+                        'with', 'by', 'is', 'are', 'was', 'were'])
+
+# Job descriptions whose ranked keywords are memoized per scorer (one posting is
+# usually scored against many resumes), keyed by SHA-256 so no request text is kept
+JOB_KEYWORDS_CACHE_SIZE = 128
+
+# Overall ATS score weights (format is scored as 100 minus the issue penalty)
+KEYWORD_WEIGHT = 0.4
+SECTION_WEIGHT = 0.3
+FORMAT_WEIGHT = 0.3
+
+# Format checks (TABLE_RE is shared with the resume cleaner)
+IMAGE_REF_RE = re.compile(r'\[(image|figure|graph|chart)\]', re.IGNORECASE)
 
 class ATSScorer:
     def __init__(self):
@@ -11,16 +40,30 @@ class ATSScorer:
             'projects', 'awards', 'languages', 'references'
         ]
         
-        # Common stopwords
-        self.stop_words = set(['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were'])
+        # One scan for every section header: a section name at the start of a line,
+        # followed by a newline, colon or space
+        self._section_re = re.compile(
+            r'^(' + '|'.join(re.escape(section) for section in
+                             sorted(self.standard_sections, key=len, reverse=True)) + r')[\n: ]',
+            re.MULTILINE
+        )
+        
+        self.stop_words = STOP_WORDS
+        
+        # Thread-safe memo of ranked job keywords; callers only read the returned lists
+        self._job_keywords_cache = OrderedDict()
+        self._job_keywords_lock = threading.Lock()
     
-    def calculate_score(self, resume_text: str, job_description: str = "") -> Dict:
-        """Calculate ATS compatibility score"""
+    def calculate_score(self, resume_text: str, job_description: str = "",
+                        job_keywords: List[str] = None) -> Dict:
+        """Calculate ATS compatibility score (pass job_keywords to reuse an earlier extraction)"""
         results = {
             'ats_score': 0,
             'keyword_match_percentage': 0,
             'matched_keywords': [],
             'missing_keywords': [],
+            'matched_count': 0,
+            'missing_count': 0,
             'section_compliance': 0,
             'format_issues': [],
             'success': True
@@ -30,13 +73,18 @@ class ATSScorer:
             return results
         
         try:
+            # Lowercase once for the case-insensitive checks
+            resume_lower = resume_text.lower()
+            
             # 1. Keyword matching with job description
             if job_description and job_description.strip():
-                keyword_results = self._analyze_keyword_match(resume_text, job_description)
+                if job_keywords is None:
+                    job_keywords = self._job_keywords(job_description)
+                keyword_results = self._analyze_keyword_match(resume_lower, job_keywords)
                 results.update(keyword_results)
             
             # 2. Section compliance check
-            section_results = self._check_section_compliance(resume_text)
+            section_results = self._check_section_compliance(resume_lower)
             results['section_compliance'] = section_results['compliance_score']
             results['format_issues'].extend(section_results['issues'])
             
@@ -48,84 +96,89 @@ class ATSScorer:
             results['ats_score'] = self._calculate_overall_ats_score(results)
             
         except Exception as e:
-            print(f"Error in ATS scoring: {e}")
+            logger.exception(f"❌ Error in ATS scoring: {e}")
             results['error'] = str(e)
             results['success'] = False
         
         return results
     
-    def _analyze_keyword_match(self, resume_text: str, job_description: str) -> Dict:
-        """Analyze keyword match between resume and job description"""
-        # Extract keywords from job description
-        job_keywords = self._extract_keywords(job_description)
-        
-        # Extract keywords from resume
-        resume_keywords = self._extract_keywords(resume_text)
-        
-        # Find matches
-        job_keywords_set = set(job_keywords)
-        resume_keywords_set = set(resume_keywords)
-        
-        matched_keywords = list(job_keywords_set.intersection(resume_keywords_set))
-        missing_keywords = list(job_keywords_set - resume_keywords_set)
+    def score_batch(self, resume_texts: List[str], job_description: str = "") -> List[Dict]:
+        """Calculate ATS scores for several resumes against one job description"""
+        # Tokenize and rank the job description once for the whole batch
+        job_keywords = self._job_keywords(job_description) if job_description else None
+        return [self.calculate_score(text, job_description, job_keywords) for text in resume_texts]
+    
+    def _analyze_keyword_match(self, resume_lower: str, job_keywords: List[str]) -> Dict:
+        """Analyze keyword match between lowercased resume text and job description keywords"""
+        # Resume keywords are only used for membership, so skip counting and ranking
+        resume_keywords_set = self._extract_keyword_set(resume_lower)
+        
+        # Partition the (unique, ranked) job keywords in one pass, so both lists come
+        # out in job-description rank order without sorting
+        matched_keywords = []
+        missing_keywords = []
+        for keyword in job_keywords:
+            if keyword in resume_keywords_set:
+                matched_keywords.append(keyword)
+            else:
+                missing_keywords.append(keyword)
         
         # Calculate match percentage
         match_percentage = 0
-        if job_keywords_set:
-            match_percentage = round((len(matched_keywords) / len(job_keywords_set)) * 100, 1)
+        if job_keywords:
+            match_percentage = round((len(matched_keywords) / len(job_keywords)) * 100, 1)
         
         return {
             'keyword_match_percentage': match_percentage,
             'matched_keywords': matched_keywords[:20],
-            'missing_keywords': missing_keywords[:20]
+            'missing_keywords': missing_keywords[:20],
+            'matched_count': len(matched_keywords),
+            'missing_count': len(missing_keywords)
         }
     
+    def _job_keywords(self, job_description: str) -> List[str]:
+        """Return the ranked keywords of a job description, memoized by its digest"""
+        key = hashlib.sha256(job_description.encode('utf-8')).digest()
+        with self._job_keywords_lock:
+            keywords = self._job_keywords_cache.get(key)
+            if keywords is not None:
+                self._job_keywords_cache.move_to_end(key)
+                return keywords
+        
+        keywords = self._extract_keywords(job_description)
+        with self._job_keywords_lock:
+            self._job_keywords_cache[key] = keywords
+            while len(self._job_keywords_cache) > JOB_KEYWORDS_CACHE_SIZE:
+                self._job_keywords_cache.popitem(last=False)
+        return keywords
+    
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract important keywords from text"""
         if not text:
             return []
         
-        # Simple tokenization
-        tokens = re.findall(r'\b[a-z][a-z0-9]*\b', text.lower())
-        
-        # Remove stopwords and short words
-        keywords = [token for token in tokens 
-                   if token not in self.stop_words and len(token) > 2]
-        
-        # Count frequency and get most common
-        if not keywords:
+        # Tokenize (length > 2 enforced by the pattern), drop stopwords and count in one pass
+        stop_words = self.stop_words
+        word_freq = Counter(token for token in TOKEN_RE.findall(text.lower())
+                            if token not in stop_words)
+        if not word_freq:
             return []
         
-        word_freq = Counter(keywords)
-        
-        # Get most common keywords (appear at least twice or are longer words)
-        common_keywords = []
-        for word, freq in word_freq.most_common(50):
-            if freq > 1 or len(word) > 5:
-                common_keywords.append(word)
+        # Top 30 keywords that appear at least twice or are longer words
+        candidates = [(word, freq) for word, freq in word_freq.items() if freq > 1 or len(word) > 5]
+        return [word for word, _ in heapq.nlargest(30, candidates, key=itemgetter(1))]
+    
+    def _extract_keyword_set(self, text_lower: str) -> set:
+        """Extract the set of all non-stopword keywords in lowercased text, unranked"""
+        if not text_lower:
+            return set()
         
-        return common_keywords[:30]
+        return set(TOKEN_RE.findall(text_lower)) - self.stop_words
     
-    def _check_section_compliance(self, resume_text: str) -> Dict:
-        """Check if resume has standard section headers"""
-        text_lower = resume_text.lower()
-        sections_found = []
-        
-        for section in self.standard_sections:
-            # Check for section headers (various formats)
-            patterns = [
-                f"\n{section}\n",
-                f"\n{section}:",
-                f"\n{section} ",
-                f"^{section}\n",
-                f"^{section}:",
-                f"^{section} "
-            ]
-            
-            for pattern in patterns:
-                if re.search(pattern, text_lower, re.MULTILINE):
-                    sections_found.append(section)
-                    break
+    def _check_section_compliance(self, resume_lower: str) -> Dict:
+        """Check if lowercased resume text has standard section headers"""
+        headers = {match.group(1) for match in self._section_re.finditer(resume_lower)}
+        sections_found = [section for section in self.standard_sections if section in headers]
         
         # Calculate compliance score
         compliance_score = 0
@@ -147,11 +200,11 @@ class ATSScorer:
         issues = []
         
         # Check for tables
-        if re.search(r'\|\s*[^|\n]+\s*\|', resume_text):
+        if TABLE_RE.search(resume_text):
             issues.append("Contains tables (may not parse correctly in ATS)")
         
         # Check for images/graphics
-        if re.search(r'\[(image|figure|graph|chart)\]', resume_text, re.IGNORECASE):
+        if IMAGE_REF_RE.search(resume_text):
             issues.append("Contains image references (ATS cannot read images)")
         
         # Check length
@@ -161,32 +214,25 @@ class ATSScorer:
         elif word_count < 200:
             issues.append(f"Resume is very short ({word_count} words). Add more details")
         
-        # Check for unusual characters
-        unusual_chars = re.findall(r'[^\x00-\x7F]', resume_text)
-        if unusual_chars:
-            issues.append(f"Contains {len(set(unusual_chars))} unusual characters")
+        # Check for unusual characters (distinct non-ASCII ones; pure ASCII skips the scan)
+        if not resume_text.isascii():
+            unusual_count = sum(1 for char in set(resume_text) if char > '\x7f')
+            issues.append(f"Contains {unusual_count} unusual characters")
         
         return {'issues': issues}
     
     def _calculate_overall_ats_score(self, results: Dict) -> float:
         """Calculate overall ATS score (0-100)"""
         try:
-            scores = []
-            
-            # Keyword match weight: 40%
-            scores.append(results.get('keyword_match_percentage', 0) * 0.4)
-            
-            # Section compliance weight: 30%
-            scores.append(results.get('section_compliance', 0) * 0.3)
-            
-            # Format issues weight: 30% (inverse)
             format_penalty = 0
             if results.get('format_issues'):
                 format_penalty = min(len(results['format_issues']) * 8, 30)
-            scores.append((100 - format_penalty) * 0.3)
             
-            # Calculate final score
-            final_score = sum(scores)
+            final_score = (
+                results.get('keyword_match_percentage', 0) * KEYWORD_WEIGHT +
+                results.get('section_compliance', 0) * SECTION_WEIGHT +
+                (100 - format_penalty) * FORMAT_WEIGHT
+            )
             return round(min(max(final_score, 0), 100), 1)
         except:
             return 70.0
\ No newline at end of file
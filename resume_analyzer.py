@@ -1,30 +1,193 @@
+import io
 import re
 import os
+import mmap
+import heapq
+import zipfile
+import unicodedata
+import xml.etree.ElementTree as ET
+from operator import itemgetter
+from functools import lru_cache
 import fitz  # PyMuPDF
-from docx import Document
-from typing import Dict, List, Tuple
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+from typing import Dict, List
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
-# Download NLTK data if needed
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    try:
-        nltk.download('punkt', quiet=True)
-        nltk.download('stopwords', quiet=True)
-    except:
-        pass
+# NLTK's English stopword list, inlined so importing needs no corpus download
+STOP_WORDS = frozenset([
+    'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', "you're", "you've",
+    "you'll", "you'd", 'your', 'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 'himself',
+    'she', "she's", 'her', 'hers', 'herself', 'it', "it's", 'its', 'itself', 'they', 'them',
+    'their', 'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this', 'that', "that'll",
+    'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has',
+    'had', 'having', 'do', 'does', 'did', 'doing', 'a', 'an', 'the', 'and', 'but', 'if', 'or',
+    'because', 'as', 'until', 'while', 'of', 'at', 'by', 'for', 'with', 'about', 'against',
+    'between', 'into', 'through', 'during', 'before', 'after', 'above', 'below', 'to', 'from',
+    'up', 'down', 'in', 'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then', 'once',
+    'here', 'there', 'when', 'where', 'why', 'how', 'all', 'any', 'both', 'each', 'few', 'more',
+    'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than',
+    'too', 'very', 's', 't', 'can', 'will', 'just', 'don', "don't", 'should', "should've", 'now',
+    'd', 'll', 'm', 'o', 're', 've', 'y', 'ain', 'aren', "aren't", 'couldn', "couldn't", 'didn',
+    "didn't", 'doesn', "doesn't", 'hadn', "hadn't", 'hasn', "hasn't", 'haven', "haven't", 'isn',
+    "isn't", 'ma', 'mightn', "mightn't", 'mustn', "mustn't", 'needn', "needn't", 'shan', "shan't",
+    'shouldn', "shouldn't", 'wasn', "wasn't", 'weren', "weren't", 'won', "won't", 'wouldn',
+    "wouldn't"
+])
+
+# Non-blank sentences for the readability score: a run of text between terminators
+# that contains at least one non-space character
+SENTENCE_RE = re.compile(r'[^.!?\s][^.!?]*')
+
+# Section keywords, one named group per section flag (matched against lowercased text)
+SECTION_FLAGS_RE = re.compile(
+    r'(?P<summary>summary|objective)|(?P<education>education)'
+    r'|(?P<experience>experience|work history|employment)'
+)
+
+# Pipe-delimited table cells (removed when cleaning, reported and flagged in validation):
+# whitespace, a run of non-pipe text on one line, whitespace. Written with possessive
+# quantifiers so the whitespace and text parts can't trade characters, which made
+# the plain form backtrack cubically on a pipe followed by a long run of spaces
+TABLE_RE = re.compile(r'\|(?:\s*+[^\s|][^|\n]*+|\n*+[^\S\n])\s*+\|')
+
+# WordprocessingML tags read when streaming a .docx body
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+DOCX_PARAGRAPH = W_NS + 'p'
+# Run children and their text (None: the element's own text); a soft hyphen is an
+# invisible break opportunity, so it contributes nothing
+DOCX_RUN_TEXT = {
+    W_NS + 't': None, W_NS + 'tab': '\t', W_NS + 'ptab': '\t', W_NS + 'br': '\n',
+    W_NS + 'cr': '\n', W_NS + 'noBreakHyphen': '-', W_NS + 'softHyphen': '',
+}
+DOCX_RUN = W_NS + 'r'
+# Paragraph children whose runs are part of the paragraph's own text; everything else
+# (w:pPr tab stops, text boxes, drawings, mc:AlternateContent) is skipped
+DOCX_RUN_CONTAINERS = frozenset([W_NS + 'hyperlink', W_NS + 'ins', W_NS + 'smartTag'])
+
+# Text files at least this large are decoded straight from a memory map
+TXT_MMAP_THRESHOLD = 64 * 1024
+
+# Email addresses (cleaned out of the text and reported as contact info); parts are
+# bounded to the RFC length limits so a failed match never rescans the rest of the text
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,255}\.[A-Za-z]{2,63}\b')
+
+# Contact details
+PHONE_RE = re.compile(r'(?<!\w)(?:\+\d{1,2}\s?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b')
+
+# Every contact field in one scan, one named group per field; profile URLs
+# match case-insensitively and are reported lowercased
+CONTACT_FIELDS = ('email', 'phone', 'linkedin', 'github')
+CONTACT_RE = re.compile(
+    r'(?P<email>' + EMAIL_RE.pattern + r')'
+    r'|(?P<phone>' + PHONE_RE.pattern + r')'
+    r'|(?P<linkedin>(?i:linkedin\.com/in/[\w\-]+))'
+    r'|(?P<github>(?i:github\.com/[\w\-]+))'
+)
+
+# Contact details normally sit in the header, so only this much is scanned first
+CONTACT_SCAN_CHARS = 2048
+
+# Image placeholders and page-number lines (cleaning report)
+IMAGE_REF_RE = re.compile(r'\[(?:image|figure|graph|chart|picture)\]', re.IGNORECASE)
+HEADER_FOOTER_RE = re.compile(r'^[^\S\n]*(?:page[^\S\n]*\d+|\d+)[^\S\n]*$', re.MULTILINE)
+
+# Word tokens for keyword density; it runs on cleaned (ASCII-only) text, so ASCII
+# matching gives the same tokens without Unicode class lookups or \b checks
+WORD_RE = re.compile(r'\w+', re.ASCII)
+
+# Everything _clean_text strips, as one alternation so the text is scanned once;
+# tables and non-ASCII runs become a space, the rest are removed outright
+CLEAN_RE = re.compile(
+    r'(?P<table>' + TABLE_RE.pattern + r')'
+    r'|(?P<image>(?i:' + IMAGE_REF_RE.pattern + r'))'
+    r'|(?P<url>https?://\S+)'
+    r'|(?P<email>' + EMAIL_RE.pattern + r')'
+    r'|(?P<phone>' + PHONE_RE.pattern + r')'
+    r'|(?P<nonascii>[^\x00-\x7F]+)'
+)
+CLEAN_REPLACEMENTS = {'table': ' ', 'nonascii': ' '}
+NON_ASCII_RE = re.compile(r'[^\x00-\x7F]')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Quantifiable achievement phrasings, one named group per pattern so a single
+# scan can keep results grouped in pattern order. The free-text gap before "by" is
+# bounded so each "increased"/"reduced"/"improved" only looks a phrase ahead,
+# keeping the scan linear on long text instead of rescanning to the end each time
+ACHIEVEMENT_PATTERNS = [
+    r'increased\s+[A-Za-z\s]{1,100}by\s+\d+%',
+    r'reduced\s+[A-Za-z\s]{1,100}by\s+\d+%',
+    r'improved\s+[A-Za-z\s]{1,100}by\s+\d+%',
+    r'achieved\s+\d+%',
+    r'saved\s+\$\d+',
+    r'generated\s+\$\d+',
+    r'managed\s+\$\d+\s+budget',
+    r'led\s+\d+\s+team',
+    r'trained\s+\d+\s+people',
+]
+ACHIEVEMENT_RE = re.compile(
+    '|'.join(f'(?P<p{i}>{pattern})' for i, pattern in enumerate(ACHIEVEMENT_PATTERNS)),
+    re.IGNORECASE
+)
+
+# Page text flags: PyMuPDF's defaults minus TEXT_PRESERVE_LIGATURES, so ligatures
+# are expanded (e.g. "ﬁ" -> "fi") instead of being stripped as non-ASCII mid-word
+PDF_TEXT_FLAGS = (fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
+                  | fitz.TEXT_CID_FOR_UNKNOWN_UNICODE)
+
+# Action verbs, counted as whole words in one scan of the lowercased text
+ACTION_VERBS = [
+    'achieved', 'managed', 'developed', 'led', 'implemented',
+    'created', 'improved', 'increased', 'reduced', 'optimized',
+    'designed', 'built', 'established', 'coordinated', 'trained',
+    'mentored', 'supervised', 'initiated', 'spearheaded', 'delivered'
+]
+ACTION_VERBS_RE = re.compile(r'\b(?:' + '|'.join(ACTION_VERBS) + r')\b')
+
+# Single-pass character cleanup: fold typographic punctuation to ASCII, turn
+# whitespace control characters (form feed, vertical tab, separators) into spaces
+# and drop other control, zero-width and (after NFKD) combining accent characters
+# before the non-ASCII strip
+CLEAN_TRANSLATION = str.maketrans(
+    {
+        '\u2018': "'", '\u2019': "'", '\u201c': '"', '\u201d': '"',
+        '\u2013': '-', '\u2014': '-', '\u2022': '-', '\u00a0': ' ',
+        **{chr(c): None for c in range(0x20) if not chr(c).isspace()},
+        '\x0b': ' ', '\x0c': ' ', '\x1c': ' ', '\x1d': ' ', '\x1e': ' ', '\x1f': ' ',
+        '\u200b': None, '\u200c': None, '\u200d': None, '\ufeff': None,
+        **{chr(c): None for c in range(0x300, 0x370)},
+    }
+)
+
+@lru_cache(maxsize=4096)
+def _is_dropped_char(char: str) -> bool:
+    """Whether cleaning removes a non-ASCII character rather than folding it to ASCII"""
+    folded = unicodedata.normalize('NFKD', char).translate(CLEAN_TRANSLATION)
+    if not folded:
+        # A bare combining accent belongs to the letter before it, which is kept
+        return not unicodedata.combining(char)
+    return not folded.isascii()
+
+@lru_cache(maxsize=8)
+def _compile_skills_re(skills: tuple) -> re.Pattern:
+    """Compile one whole-word alternation over skills, memoized per taxonomy"""
+    # Longest first so multi-word skills win; bounded so short skills don't match inside longer words
+    ordered = sorted(skills, key=len, reverse=True)
+    return re.compile(r'(?<!\w)(?:' + '|'.join(re.escape(skill) for skill in ordered) + r')(?!\w)')
+
+@lru_cache(maxsize=8)
+def _find_nested_skills(skills: tuple) -> Dict[str, List[str]]:
+    """Map each skill to the other skills it contains as whole words, memoized per taxonomy"""
+    nested_skills = {}
+    for skill in skills:
+        nested = [other for other in skills if other != skill
+                  and re.search(r'(?<!\w)' + re.escape(other) + r'(?!\w)', skill)]
+        if nested:
+            nested_skills[skill] = nested
+    return nested_skills
 
 class ResumeAnalyzer:
     def __init__(self):
-        try:
-            self.stop_words = set(stopwords.words('english'))
-        except:
-            self.stop_words = set(['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'])
+        self.stop_words = STOP_WORDS
         
         # Common skills database
         self.technical_skills = [
@@ -41,6 +204,32 @@ class ResumeAnalyzer:
             'critical thinking', 'time management', 'adaptability', 'creativity',
             'collaboration', 'project management', 'agile', 'scrum'
         ]
+        
+        # Common spellings mapped to their canonical skill
+        self.skill_aliases = {
+            'js': 'javascript', 'reactjs': 'react', 'react.js': 'react',
+            'nodejs': 'node.js', 'vuejs': 'vue.js', 'nextjs': 'next.js',
+            'angularjs': 'angular', 'cpp': 'c++', 'c sharp': 'c#',
+            'mongo': 'mongodb', 'postgres': 'postgresql', 'k8s': 'kubernetes',
+            'amazon web services': 'aws', 'html5': 'html', 'css3': 'css',
+            'powerbi': 'power bi', 'restful api': 'rest api', 'rest apis': 'rest api',
+            'problem-solving': 'problem solving', 'team work': 'teamwork'
+        }
+        
+        # Hash sets for classifying matched skills
+        self._technical_skills_set = frozenset(self.technical_skills)
+        self._soft_skills_set = frozenset(self.soft_skills)
+        
+        # Deduplicated taxonomy in declaration order, with each skill's display form
+        self._all_skills = list(dict.fromkeys(self.technical_skills + self.soft_skills))
+        self._skill_titles = {skill: skill.title() for skill in self._all_skills}
+        
+        # One alternation over every skill and alias, shared by analyzers with the same taxonomy
+        self._skills_re = _compile_skills_re(tuple(self._all_skills) + tuple(self.skill_aliases))
+        
+        # Skills that contain another skill as a whole word ('react native' -> 'react'); the
+        # longest-first scan only reports the outer one, so these fill in the nested matches
+        self._nested_skills = _find_nested_skills(tuple(self._all_skills))
     
     def extract_and_clean_resume(self, filepath: str) -> Dict:
         """Extract text from file and clean it"""
@@ -52,138 +241,201 @@ class ResumeAnalyzer:
             elif ext in ['docx', 'doc']:
                 text = self._extract_from_docx(filepath)
             elif ext == 'txt':
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    text = f.read()
+                text = self._read_text_file(filepath)
             else:
                 raise ValueError(f"Unsupported file format: {ext}")
             
-            # Clean the text
-            cleaned_text = self._clean_text(text)
-            
-            # Analyze the text
-            analysis = self.analyze_resume(cleaned_text)
-            
-            # Extract contact info
-            contact_info = self._extract_contact_info(text)
-            
-            # Generate cleaning report
-            cleaning_report = self._generate_cleaning_report(text, cleaned_text)
+            return self._process_text(text)
             
-            # Validation
-            validation = self._validate_resume(cleaned_text)
+        except Exception as e:
+            raise ValueError(f"Error processing file: {str(e)}")
+    
+    def extract_and_clean_batch(self, filepaths: List[str], max_workers: int = None) -> List[Dict]:
+        """Extract and clean several resume files in parallel worker processes"""
+        if max_workers is None:
+            max_workers = min(os.cpu_count() or 1, 4)
+        
+        # Not worth spawning processes for a single file
+        if len(filepaths) < 2 or max_workers < 2:
+            return [self.extract_and_clean_resume(filepath) for filepath in filepaths]
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_extract_and_clean_in_worker, filepaths))
+    
+    def extract_and_clean_from_bytes(self, buf: bytes) -> Dict:
+        """Extract text from an in-memory upload and clean it"""
+        try:
+            # Detect the format from the file's magic bytes
+            if buf.startswith(b'%PDF'):
+                text = self._extract_from_pdf(buf)
+            elif buf.startswith(b'PK\x03\x04'):
+                text = self._extract_from_docx(io.BytesIO(buf))
+            elif buf.startswith(b'\xd0\xcf\x11\xe0'):
+                raise ValueError("Unsupported file format: legacy .doc")
+            else:
+                text = buf.decode('utf-8', errors='ignore')
             
-            # Word density analysis
-            word_density = self._calculate_word_density(cleaned_text)
-            
-            return {
-                'cleaned_text': cleaned_text,
-                'cleaning_report': cleaning_report,
-                'validation': validation,
-                'contact_info': contact_info,
-                'word_density': word_density,
-                'original_text': text[:1000]  # Store first 1000 chars for reference
-            }
+            return self._process_text(text)
             
         except Exception as e:
             raise ValueError(f"Error processing file: {str(e)}")
     
-    def _extract_from_pdf(self, filepath: str) -> str:
-        """Extract text from PDF"""
-        text = ""
+    def _process_text(self, text: str) -> Dict:
+        """Clean extracted text and build the extraction result"""
+        # Clean the text
+        cleaned_text = self._clean_text(text)
+        
+        # Extract contact info
+        contact_info = self._extract_contact_info(text)
+        
+        # Generate cleaning report
+        cleaning_report = self._generate_cleaning_report(text, cleaned_text)
+        
+        # Validation
+        validation = self._validate_resume(cleaned_text)
+        
+        # Word density analysis
+        word_density = self._calculate_word_density(cleaned_text)
+        
+        return {
+            'cleaned_text': cleaned_text,
+            'cleaning_report': cleaning_report,
+            'validation': validation,
+            'contact_info': contact_info,
+            'word_density': word_density,
+            'original_text': text[:1000]  # Store first 1000 chars for reference
+        }
+    
+    def _read_text_file(self, filepath: str) -> str:
+        """Read a UTF-8 text file, memory-mapping large ones to skip the intermediate bytes copy"""
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < TXT_MMAP_THRESHOLD:
+                return f.read().decode('utf-8', errors='ignore')
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return str(mm, 'utf-8', 'ignore')
+    
+    def _extract_from_pdf(self, source) -> str:
+        """Extract text from a PDF path or in-memory bytes"""
         try:
-            doc = fitz.open(filepath)
-            for page in doc:
-                text += page.get_text()
-            doc.close()
+            if isinstance(source, bytes):
+                doc = fitz.open(stream=source, filetype='pdf')
+            else:
+                doc = fitz.open(source)
+            with doc:
+                return "".join(page.get_text(flags=PDF_TEXT_FLAGS) for page in doc)
         except Exception as e:
             raise Exception(f"PDF extraction failed: {str(e)}")
-        return text
     
-    def _extract_from_docx(self, filepath: str) -> str:
-        """Extract text from DOCX"""
+    def _extract_from_docx(self, source) -> str:
+        """Extract text from a DOCX path or file-like object"""
         try:
-            doc = Document(filepath)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-            return text
+            # Stream word/document.xml instead of building a document model; like
+            # python-docx's document.paragraphs, only body-level paragraphs are kept
+            # (document > body > p, i.e. depth 3), one per line
+            paragraphs = []
+            depth = 0
+            with zipfile.ZipFile(source) as docx_zip, docx_zip.open('word/document.xml') as xml:
+                for event, element in ET.iterparse(xml, events=('start', 'end')):
+                    if event == 'start':
+                        depth += 1
+                        continue
+                    
+                    depth -= 1
+                    if depth == 2:
+                        # A body-level element closed: keep its text if it was a
+                        # paragraph, then free its subtree
+                        if element.tag == DOCX_PARAGRAPH:
+                            paragraphs.append(''.join(self._docx_paragraph_text(element)))
+                        element.clear()
+            return "\n".join(paragraphs)
         except Exception as e:
             raise Exception(f"DOCX extraction failed: {str(e)}")
     
+    def _docx_paragraph_text(self, container):
+        """Yield the text of runs directly under a paragraph or one of its run containers"""
+        for child in container:
+            if child.tag == DOCX_RUN:
+                for item in child:
+                    if item.tag in DOCX_RUN_TEXT:
+                        yield DOCX_RUN_TEXT[item.tag] or item.text or ''
+            elif child.tag in DOCX_RUN_CONTAINERS:
+                yield from self._docx_paragraph_text(child)
+    
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text"""
-        # Remove tables (pipe tables)
-        text = re.sub(r'\|\s*[^|\n]+\s*\|', ' ', text)
-        
-        # Remove image references
-        text = re.sub(r'\[(image|figure|graph|chart|picture)\]', '', text, flags=re.IGNORECASE)
-        
-        # Remove URLs
-        text = re.sub(r'https?://\S+', '', text)
-        
-        # Remove email addresses
-        text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '', text)
+        # Decompose accented letters so the translate below keeps the base letter
+        # ("café" -> "cafe"); pure-ASCII text skips this entirely
+        if not text.isascii():
+            text = unicodedata.normalize('NFKD', text)
         
-        # Remove phone numbers
-        text = re.sub(r'\b(\+\d{1,2}\s?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b', '', text)
+        # Fold smart quotes/dashes and drop control characters in one pass
+        text = text.translate(CLEAN_TRANSLATION)
         
-        # Remove unusual characters (keep basic punctuation)
-        text = re.sub(r'[^\x00-\x7F]+', ' ', text)
+        # Remove tables, image references, URLs, emails, phone numbers and
+        # unusual characters in a single scan
+        text = CLEAN_RE.sub(lambda match: CLEAN_REPLACEMENTS.get(match.lastgroup, ''), text)
         
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\n\s*\n+', '\n', text)
-        
-        return text.strip()
+        # Collapse whitespace (this also removes blank lines)
+        return WHITESPACE_RE.sub(' ', text).strip()
     
     def analyze_resume(self, text: str) -> Dict:
         """Analyze resume text"""
         # Basic metrics
-        words = text.split()
-        word_count = len(words)
+        word_count = len(text.split())
         
-        # Extract skills
+        # Extract skills in a single pass over the text
         text_lower = text.lower()
+        # (a dict keeps them deduplicated in order of first appearance)
+        aliases = self.skill_aliases
+        found_skills = {}
+        for skill in self._skills_re.findall(text_lower):
+            skill = aliases.get(skill, skill)
+            found_skills[skill] = None
+            for nested in self._nested_skills.get(skill, ()):
+                found_skills[nested] = None
+        
+        # Look up display names and classify technical vs soft on the lowercase keys
+        skill_titles = self._skill_titles
         skills_found = []
-        
-        # Check for technical skills
-        for skill in self.technical_skills:
-            if skill in text_lower:
-                skills_found.append(skill.title())
-        
-        # Check for soft skills
-        for skill in self.soft_skills:
-            if skill in text_lower:
-                skills_found.append(skill.title())
-        
-        # Remove duplicates
-        skills_found = list(set(skills_found))
+        technical_skills = []
+        soft_skills = []
+        for skill in found_skills:
+            title = skill_titles[skill]
+            skills_found.append(title)
+            if skill in self._technical_skills_set:
+                technical_skills.append(title)
+            if skill in self._soft_skills_set:
+                soft_skills.append(title)
         
         # Calculate readability (simplified)
-        readability_score = self._calculate_readability(text)
+        readability_score = self._calculate_readability(text, word_count)
         
         # Find quantifiable achievements
         quantifiable_achievements = self._find_quantifiable_achievements(text)
         
         # Count action verbs
-        action_verbs_count = self._count_action_verbs(text)
+        action_verbs_count = self._count_action_verbs(text_lower)
         
         # Calculate skills match percentage
-        all_skills = self.technical_skills + self.soft_skills
-        found_skills_count = sum(1 for skill in all_skills if skill in text_lower)
-        skills_match_percentage = round((found_skills_count / len(all_skills)) * 100, 1) if all_skills else 0
-        
-        # Get missing skills (top 10)
-        found_skills_set = set(skill.lower() for skill in skills_found)
-        all_skills_set = set(skill.lower() for skill in all_skills)
-        missing_skills = [skill.title() for skill in list(all_skills_set - found_skills_set)[:10]]
-        
-        # Check sections
-        has_summary = 'summary' in text_lower[:200] or 'objective' in text_lower[:200]
-        has_education = 'education' in text_lower
-        has_experience = any(term in text_lower for term in ['experience', 'work history', 'employment'])
+        all_skills = self._all_skills
+        skills_match_percentage = round((len(found_skills) / len(all_skills)) * 100, 1) if all_skills else 0
+        
+        # Get missing skills (top 10), in taxonomy order, probing the found set once per skill
+        missing_skills = []
+        for skill in all_skills:
+            if skill not in found_skills:
+                missing_skills.append(skill_titles[skill])
+                if len(missing_skills) == 10:
+                    break
         
-        # Technical vs soft skills
-        technical_skills = [s for s in skills_found if s.lower() in [ts.lower() for ts in self.technical_skills]]
-        soft_skills = [s for s in skills_found if s.lower() in [ss.lower() for ss in self.soft_skills]]
+        # Check sections in a single pass (summary only counts near the top)
+        sections = set()
+        for match in SECTION_FLAGS_RE.finditer(text_lower):
+            if match.lastgroup != 'summary' or match.end() <= 200:
+                sections.add(match.lastgroup)
+        has_summary = 'summary' in sections
+        has_education = 'education' in sections
+        has_experience = 'experience' in sections
         
         return {
             'word_count': word_count,
@@ -202,23 +454,20 @@ class ResumeAnalyzer:
             'has_experience': has_experience
         }
     
-    def _calculate_readability(self, text: str) -> float:
+    def _calculate_readability(self, text: str, word_count: int) -> float:
         """Calculate simplified readability score"""
         try:
-            # Count sentences
-            sentences = re.split(r'[.!?]+', text)
-            sentences = [s.strip() for s in sentences if s.strip()]
+            # Count sentences without materializing them
+            sentence_count = sum(1 for _ in SENTENCE_RE.finditer(text))
             
-            if not sentences:
+            if not sentence_count:
                 return 50.0
             
-            # Count words
-            words = text.split()
-            if len(words) < 10:
+            if word_count < 10:
                 return 50.0
             
             # Simple Flesch score approximation
-            avg_sentence_length = len(words) / len(sentences)
+            avg_sentence_length = word_count / sentence_count
             
             # Simplified readability formula
             score = 100 - (avg_sentence_length * 1.0)
@@ -228,103 +477,79 @@ class ResumeAnalyzer:
     
     def _find_quantifiable_achievements(self, text: str) -> List[str]:
         """Find quantifiable achievements"""
-        patterns = [
-            r'increased\s+[A-Za-z\s]+by\s+\d+%',
-            r'reduced\s+[A-Za-z\s]+by\s+\d+%',
-            r'improved\s+[A-Za-z\s]+by\s+\d+%',
-            r'achieved\s+\d+%',
-            r'saved\s+\$\d+',
-            r'generated\s+\$\d+',
-            r'managed\s+\$\d+\s+budget',
-            r'led\s+\d+\s+team',
-            r'trained\s+\d+\s+people',
-        ]
+        # One scan for every pattern, keeping at most two matches per pattern
+        matches_by_pattern = {}
+        for match in ACHIEVEMENT_RE.finditer(text):
+            matches = matches_by_pattern.setdefault(match.lastgroup, [])
+            if len(matches) < 2:
+                matches.append(match.group())
         
         achievements = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            achievements.extend(matches[:2])
+        for i in range(len(ACHIEVEMENT_PATTERNS)):
+            achievements.extend(matches_by_pattern.get(f'p{i}', ()))
         
         return achievements[:5]
     
-    def _count_action_verbs(self, text: str) -> int:
-        """Count action verbs"""
-        action_verbs = [
-            'achieved', 'managed', 'developed', 'led', 'implemented',
-            'created', 'improved', 'increased', 'reduced', 'optimized',
-            'designed', 'built', 'established', 'coordinated', 'trained',
-            'mentored', 'supervised', 'initiated', 'spearheaded', 'delivered'
-        ]
-        
-        count = 0
-        text_lower = text.lower()
-        for verb in action_verbs:
-            count += text_lower.count(verb)
-        
-        return count
+    def _count_action_verbs(self, text_lower: str) -> int:
+        """Count action verbs in lowercased text"""
+        return sum(1 for _ in ACTION_VERBS_RE.finditer(text_lower))
     
     def _extract_contact_info(self, text: str) -> Dict:
         """Extract contact information"""
-        contact = {}
-        
-        # Email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        if emails:
-            contact['email'] = emails[0]
-        
-        # Phone
-        phone_pattern = r'\b(\+\d{1,2}\s?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b'
-        phones = re.findall(phone_pattern, text)
-        if phones:
-            contact['phone'] = phones[0]
-        
-        # LinkedIn
-        linkedin_pattern = r'linkedin\.com/in/[\w\-]+'
-        linkedin = re.findall(linkedin_pattern, text.lower())
-        if linkedin:
-            contact['linkedin'] = linkedin[0]
-        
-        # GitHub
-        github_pattern = r'github\.com/[\w\-]+'
-        github = re.findall(github_pattern, text.lower())
-        if github:
-            contact['github'] = github[0]
-        
+        # Scan the header first; only fall back to the full text for missing fields. The
+        # header ends at the last whitespace before the limit so no match is cut short
+        header = text
+        if len(text) > CONTACT_SCAN_CHARS:
+            parts = text[:CONTACT_SCAN_CHARS].rsplit(None, 1)
+            header = parts[0] if len(parts) == 2 else ''
+        contact = self._scan_contact_info(header, {})
+        if len(contact) < len(CONTACT_FIELDS) and len(text) > len(header):
+            contact = self._scan_contact_info(text, contact)
+        
+        return {field: contact[field] for field in CONTACT_FIELDS if field in contact}
+    
+    def _scan_contact_info(self, text: str, contact: Dict) -> Dict:
+        """Fill in the first match of each contact field not already in contact"""
+        for match in CONTACT_RE.finditer(text):
+            field = match.lastgroup
+            if field not in contact:
+                value = match.group()
+                contact[field] = value.lower() if field in ('linkedin', 'github') else value
+                if len(contact) == len(CONTACT_FIELDS):
+                    break
         return contact
     
     def _generate_cleaning_report(self, original_text: str, cleaned_text: str) -> Dict:
         """Generate cleaning report"""
-        # Count tables (simple detection)
-        table_matches = re.findall(r'\|\s*[^|\n]+\s*\|', original_text)
-        
-        # Count image references
-        image_matches = re.findall(r'\[(image|figure|graph|chart|picture)\]', original_text, re.IGNORECASE)
-        
-        # Count unusual characters
-        unusual_chars = re.findall(r'[^\x00-\x7F]', original_text)
-        
-        # Count headers/footers (simple detection)
-        header_footer_patterns = [r'^\s*page\s*\d+\s*$', r'^\s*\d+\s*$']
-        headers_footers = 0
-        for line in original_text.split('\n'):
-            for pattern in header_footer_patterns:
-                if re.match(pattern, line.strip()):
-                    headers_footers += 1
-                    break
+        # Count tables and image references without building match lists
+        tables_count = sum(1 for _ in TABLE_RE.finditer(original_text))
+        images_count = sum(1 for _ in IMAGE_REF_RE.finditer(original_text))
+        
+        # Count unusual characters cleaning actually drops (accented letters, smart quotes
+        # and the like are transliterated, not removed)
+        unusual_chars_count = 0
+        if not original_text.isascii():
+            unusual_chars_count = sum(count for char, count in
+                                      Counter(NON_ASCII_RE.findall(original_text)).items()
+                                      if _is_dropped_char(char))
+        
+        # Count headers/footers (lines that are just a page number) in one multiline scan
+        headers_footers = sum(1 for _ in HEADER_FOOTER_RE.finditer(original_text))
         
         original_length = len(original_text)
         final_length = len(cleaned_text)
+        # NFKD can expand characters ('\ufb01' -> 'fi'), so the cleaned text may come out
+        # longer than the original; report that as no reduction
         reduction_percentage = 0
-        if original_length > 0:
+        if original_length > final_length:
             reduction_percentage = round(((original_length - final_length) / original_length) * 100, 2)
         
         return {
             'original_length': original_length,
             'final_length': final_length,
-            'tables_removed': len(table_matches),
-            'images_detected': len(image_matches),
-            'unusual_chars_removed': len(unusual_chars),
+            'tables_removed': tables_count,
+            'images_detected': images_count,
+            'unusual_chars_removed': unusual_chars_count,
             'headers_footers_removed': headers_footers,
             'reduction_percentage': reduction_percentage
         }
@@ -348,24 +573,24 @@ class ResumeAnalyzer:
             validation['validation_passed'] = False
         
         # Check for tables
-        if re.search(r'\|\s*[^|\n]+\s*\|', text):
+        if TABLE_RE.search(text):
             validation['issues'].append('Contains tables (may not parse well in ATS)')
             validation['validation_passed'] = False
         
-        # Check for unusual characters
-        unusual_chars = re.findall(r'[^\x00-\x7F]', text)
-        if unusual_chars:
-            validation['issues'].append(f'Contains {len(set(unusual_chars))} unusual characters')
+        # Check for unusual characters (distinct non-ASCII ones; pure ASCII skips the scan)
+        if not text.isascii():
+            unusual_count = sum(1 for char in set(text) if char > '\x7f')
+            validation['issues'].append(f'Contains {unusual_count} unusual characters')
         
         return validation
     
     def _calculate_word_density(self, text: str) -> Dict:
         """Calculate word frequency and density"""
         try:
-            # Simple word extraction
-            words = re.findall(r'\b\w+\b', text.lower())
+            # Count words straight from the token list; unique and total come from the counter
+            word_freq = Counter(WORD_RE.findall(text.lower()))
             
-            if not words:
+            if not word_freq:
                 return {
                     'total_words': 0,
                     'unique_words': 0,
@@ -373,18 +598,17 @@ class ResumeAnalyzer:
                     'keyword_density': {}
                 }
             
-            # Count frequency
-            word_freq = Counter(words)
-            
-            # Remove stopwords and short words
-            filtered_words = {word: freq for word, freq in word_freq.items() 
-                             if word not in self.stop_words and len(word) > 2}
-            
-            # Get top keywords (max 20)
-            top_keywords = sorted(filtered_words.items(), key=lambda x: x[1], reverse=True)[:20]
+            # Top keywords (max 20), skipping stopwords and short words
+            stop_words = self.stop_words
+            top_keywords = heapq.nlargest(
+                20,
+                ((word, freq) for word, freq in word_freq.items()
+                 if len(word) > 2 and word not in stop_words),
+                key=itemgetter(1)
+            )
             
             # Calculate density
-            total_words = len(words)
+            total_words = sum(word_freq.values())
             keyword_density = {}
             for word, freq in top_keywords[:10]:
                 if total_words > 0:
@@ -392,7 +616,7 @@ class ResumeAnalyzer:
             
             return {
                 'total_words': total_words,
-                'unique_words': len(set(words)),
+                'unique_words': len(word_freq),
                 'top_keywords': top_keywords,
                 'keyword_density': keyword_density
             }
@@ -402,4 +626,14 @@ class ResumeAnalyzer:
                 'unique_words': 0,
                 'top_keywords': [],
                 'keyword_density': {}
-            }
\ No newline at end of file
+            }
+
+# Analyzer reused by every task a batch worker process runs
+_worker_analyzer = None
+
+def _extract_and_clean_in_worker(filepath: str) -> Dict:
+    """Batch worker entry point: extract and clean one file with the process's analyzer"""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = ResumeAnalyzer()
+    return _worker_analyzer.extract_and_clean_resume(filepath)